@@ -7,107 +7,405 @@ Scraper LinkedIn via ScrapingDog API
 Ce script permet de collecter des posts LinkedIn en français sur l'IA 
 en utilisant l'API ScrapingDog, qui permet d'éviter les blocages de LinkedIn.
 Il extrait également les métriques d'engagement (likes, commentaires, partages) quand c'est possible.
+
+Dépendances : aiohttp, ijson
+Optionnelles : orjson (JSON plus rapide), brotli (réponses compressées en br)
 """
 
-import requests
-import json
+import aiohttp
+import asyncio
+import ijson
+from ijson.common import ObjectBuilder
 import csv
+import math
 import os
+import shelve
 import time
-import random
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import argparse
 
+# aiohttp ne sait décompresser le brotli que si le module est installé
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Sérialisation JSON accélérée si orjson est installé
+try:
+    import orjson
+    json_loads = orjson.loads
+    
+    def json_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    import json
+    json_loads = json.loads
+    
+    def json_line(obj):
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode('utf-8')
+
 # Dossier pour sauvegarder les résultats
 RESULTS_DIR = 'resultats'
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# Index des URLs déjà extraites avec succès, conservé d'une exécution à l'autre
+INDEX_PATH = os.path.join(RESULTS_DIR, 'urls_extraites.txt')
+
+# Cache des posts extraits et de leurs validateurs HTTP (ETag, Last-Modified), par URL
+POST_CACHE_PATH = os.path.join(RESULTS_DIR, 'cache_posts')
+
+# Colonnes du fichier CSV de résultats
+CSV_FIELDNAMES = ['url', 'author', 'date', 'text', 'likes', 'comments', 'shares', 'success']
+
+# Nombre de posts écrits entre deux vidages des fichiers de résultats sur disque
+FLUSH_EVERY = 10
+
+# Champs du post lus dans la réponse de l'API
+POST_FIELDS = ('text', 'author', 'date', 'likes', 'comments', 'shares')
+
+# Taille à partir de laquelle une réponse est analysée en flux plutôt qu'en bloc.
+# Il s'agit de la taille transmise (Content-Length), donc compressée en gzip/br :
+# 8 Ko compressés représentent typiquement 40 à 80 Ko de JSON.
+STREAM_MIN_SIZE = 8 * 1024
+
+# Codes HTTP pour lesquels une requête est réessayée
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        """
+        Limiteur de débit à seau de jetons, partagé entre les requêtes concurrentes
+        
+        Args:
+            rate (float): Nombre de jetons ajoutés par seconde (requêtes/s autorisées)
+            capacity (int): Nombre maximum de jetons (taille de rafale autorisée)
+            
+        Raises:
+            ValueError: Si rate n'est pas strictement positif ou si capacity est inférieur à 1
+        """
+        if rate <= 0:
+            raise ValueError(f"rate doit être strictement positif (reçu: {rate})")
+        if capacity < 1:
+            raise ValueError(f"capacity doit être au moins 1 (reçu: {capacity})")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = None
+    
+    def _refill(self):
+        """Ajoute les jetons accumulés depuis le dernier passage"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+    
+    async def take(self, n=1):
+        """
+        Consomme n jetons, en attendant seulement si le seau est vide
+        
+        Args:
+            n (int): Nombre de jetons à consommer
+        """
+        # Verrou créé à la première utilisation, dans la boucle d'événements courante
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self.tokens < n:
+                await asyncio.sleep((n - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= n
+
 class LinkedInScrapingDogAPI:
-    def __init__(self, api_key, pause_min=1, pause_max=3):
+    def __init__(self, api_key, rate=5, burst=10, max_connections=10, max_workers=8, max_retries=3,
+                 backoff_factor=0.5, timeout=30):
         """
         Initialise le scraper basé sur l'API ScrapingDog
         
         Args:
             api_key (str): Clé API ScrapingDog
-            pause_min (int): Délai minimum entre les requêtes (en secondes)
-            pause_max (int): Délai maximum entre les requêtes (en secondes)
+            rate (float): Nombre maximum de requêtes par seconde autorisées par l'API
+            burst (int): Nombre de requêtes pouvant partir d'un coup avant d'être limité
+            max_connections (int): Taille du pool de connexions (requêtes simultanées) vers l'API
+            max_workers (int): Nombre maximum d'extractions de posts en cours simultanément
+            max_retries (int): Nombre maximum de tentatives par requête (429, erreur serveur ou réseau)
+            backoff_factor (float): Délai de base avant de réessayer, doublé à chaque tentative (en secondes)
+            timeout (float): Durée maximale d'une requête, lecture de la réponse comprise (en secondes)
         """
         self.api_key = api_key
-        self.pause_min = pause_min
-        self.pause_max = pause_max
+        self.bucket = TokenBucket(rate, burst)
+        self.max_connections = max_connections
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
         self.base_url = "https://api.scrapingdog.com/linkedin"
         self.found_urls = set()
-        self.results = []
+        self.seen_urls = self._load_index()
+        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.session = None
+        self.post_cache = None
+        self._encoding_logged = False
         
-    def random_pause(self):
-        """Pause aléatoire pour éviter de surcharger l'API"""
-        sleep_time = random.uniform(self.pause_min, self.pause_max)
+    @staticmethod
+    def _parse_retry_after(value):
+        """Convertit un en-tête Retry-After (secondes ou date HTTP) en délai, None si invalide"""
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    async def backoff(self, attempt, retry_after=None):
+        """
+        Pause avant de réessayer : délai imposé par l'API (Retry-After) s'il est
+        connu, pause exponentielle sinon
+        """
+        sleep_time = self._parse_retry_after(retry_after)
+        if sleep_time is None:
+            sleep_time = self.backoff_factor * (2 ** attempt)
         print(f"Pause de {sleep_time:.2f} secondes...")
-        time.sleep(sleep_time)
+        await asyncio.sleep(sleep_time)
     
-    def search_linkedin_posts(self, keywords, language='fr', max_results=100):
+    def _get_session(self):
+        """
+        Renvoie la session HTTP du scraper, en la créant au premier appel
+        
+        La même session (et donc le même pool de connexions keep-alive) est
+        réutilisée pour toutes les requêtes, ce qui évite une poignée de main
+        TLS par appel. Les réponses compressées sont demandées explicitement.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"Accept-Encoding": ACCEPT_ENCODING},
+                auto_decompress=True
+            )
+        return self.session
+    
+    def _get_post_cache(self):
+        """Renvoie le cache persistant des posts extraits, en l'ouvrant au premier appel"""
+        if self.post_cache is None:
+            self.post_cache = shelve.open(POST_CACHE_PATH)
+        return self.post_cache
+    
+    async def close(self):
+        """Ferme la session HTTP, libère les connexions du pool et enregistre le cache des posts"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.post_cache is not None:
+            self.post_cache.close()
+            self.post_cache = None
+    
+    async def _read_fields(self, response, prefix, fields):
+        """
+        Analyse la réponse en flux et ne conserve que certains champs d'un objet
+        
+        Seuls les champs demandés sont construits en mémoire : les autres
+        sous-arbres (médias, détails de l'auteur, etc.) sont parcourus sans
+        être matérialisés.
+        
+        Args:
+            response (aiohttp.ClientResponse): Réponse HTTP à lire
+            prefix (str): Clé de l'objet JSON à parcourir
+            fields (tuple): Champs de l'objet à conserver
+            
+        Returns:
+            dict: Réponse réduite à {prefix: {champ: valeur}}, vide si l'objet est absent
+        """
+        wanted = {f"{prefix}.{field}": field for field in fields}
+        obj = {}
+        builder = None
+        current = None
+        
+        # La réponse est lue jusqu'au bout pour que la connexion reste réutilisable
+        async for path, event, value in ijson.parse_async(response.content, use_float=True):
+            if builder is not None:
+                # Construction en cours d'un champ objet ou tableau
+                builder.event(event, value)
+                if path == current and event in ('end_map', 'end_array'):
+                    obj[wanted[current]] = builder.value
+                    builder = None
+            elif path in wanted and event != 'map_key':
+                if event in ('start_map', 'start_array'):
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                    current = path
+                else:
+                    obj[wanted[path]] = value
+        return {prefix: obj} if obj else {}
+    
+    async def _fetch(self, params, prefix=None, fields=None, headers=None):
+        """
+        Effectue une requête à l'API ScrapingDog, en réessayant après un 429, une
+        erreur serveur, une erreur réseau ou un dépassement du délai
+        
+        Args:
+            params (dict): Paramètres de la requête
+            prefix (str, optional): Clé de l'objet à analyser en flux pour les grosses réponses
+            fields (tuple, optional): Champs de cet objet à conserver
+            headers (dict, optional): En-têtes HTTP supplémentaires (requêtes conditionnelles)
+            
+        Returns:
+            tuple: Code HTTP, corps de la réponse (dict si 200, texte sinon) et en-têtes de la réponse
+            
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: Si la dernière tentative échoue sur le réseau
+        """
+        session = self._get_session()
+        for attempt in range(self.max_retries):
+            last_attempt = attempt == self.max_retries - 1
+            retry_after = None
+            
+            # Respecter le débit autorisé par l'API
+            await self.bucket.take()
+            try:
+                async with session.get(self.base_url, params=params, headers=headers) as response:
+                    if not self._encoding_logged:
+                        print(f"Encodage des réponses de l'API: {response.headers.get('Content-Encoding', 'aucun')}")
+                        self._encoding_logged = True
+                    if response.status == 200:
+                        # Analyse en flux des grosses réponses, en bloc sinon (taille inconnue comprise)
+                        size = response.content_length
+                        if prefix is not None and size is not None and size >= STREAM_MIN_SIZE:
+                            data = await self._read_fields(response, prefix, fields)
+                        else:
+                            data = await response.json(loads=json_loads, content_type=None)
+                        return response.status, data, response.headers
+                    if response.status not in RETRY_STATUSES or last_attempt:
+                        return response.status, await response.text(), response.headers
+                    if response.status == 429:
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                print(f"  -> Erreur réseau ({e!r}), nouvelle tentative...")
+            
+            # API saturée, indisponible ou injoignable : on patiente avant de réessayer
+            await self.backoff(attempt, retry_after)
+    
+    async def _search_page(self, search_term, language, limit, page=1):
+        """
+        Lance une recherche ScrapingDog et collecte les URLs trouvées
+        
+        Args:
+            search_term (str): Terme de recherche (mot-clé ou requête OR)
+            language (str): Langue des résultats ('fr' pour français)
+            limit (int): Nombre de résultats demandés par page
+            page (int): Numéro de la page de résultats
+            
+        Returns:
+            int: Nombre de posts renvoyés par l'API (0 en cas d'erreur)
+        """
+        print(f"\nRecherche pour: {search_term} (page {page})")
+        
+        # Paramètres pour l'API ScrapingDog
+        params = {
+            "api_key": self.api_key,
+            "type": "search",
+            "search_term": search_term,
+            "content_type": "posts",
+            "language": language,
+            "limit": limit,
+            "page": page
+        }
+        
+        try:
+            status, data, _ = await self._fetch(params)
+            
+            if status == 200:
+                posts = data.get("posts", [])
+                
+                # Extraire les URLs des posts
+                if isinstance(posts, list):
+                    for post in posts:
+                        if "url" in post:
+                            self.found_urls.add(post["url"])
+                            print(f"  -> Trouvé: {post['url']}")
+                else:
+                    posts = []
+                
+                print(f"  -> {len(posts)} posts trouvés pour '{search_term}'")
+                return len(posts)
+            else:
+                print(f"  -> Erreur API ({status}): {data}")
+            
+        except aiohttp.ClientError as e:
+            print(f"Erreur lors de la requête à l'API: {e}")
+        except Exception as e:
+            print(f"Une erreur inattendue s'est produite: {e}")
+        
+        return 0
+    
+    async def search_linkedin_posts(self, keywords, language='fr', max_results=100, min_results=10):
         """
         Recherche des posts LinkedIn via l'API ScrapingDog
         
+        Tous les mots-clés sont combinés en une seule requête OR, paginée
+        jusqu'à max_results. Si elle renvoie moins de min_results URLs, une
+        recherche par mot-clé est lancée en parallèle en complément.
+        
         Args:
             keywords (list): Liste de mots-clés à rechercher
             language (str): Langue des résultats ('fr' pour français)
             max_results (int): Nombre maximum de résultats à récupérer
+            min_results (int): Nombre d'URLs en dessous duquel on recherche mot-clé par mot-clé
+                (plafonné à max_results)
             
         Returns:
             set: Ensemble des URLs LinkedIn trouvées
+            
+        Raises:
+            ValueError: Si max_results n'est pas strictement positif
         """
+        if max_results <= 0:
+            raise ValueError(f"max_results doit être strictement positif (reçu: {max_results})")
+        
         print(f"Recherche de posts LinkedIn avec les mots-clés: {keywords}")
         
         # Construire la requête de recherche
         keyword_query = " OR ".join(keywords)
+        limit = min(100, max_results)  # Maximum 100 par requête
         
-        # Paramètres pour l'API ScrapingDog
-        for keyword in keywords:
-            print(f"\nRecherche pour le mot-clé: {keyword}")
-            
-            params = {
-                "api_key": self.api_key,
-                "type": "search",
-                "search_term": keyword,
-                "content_type": "posts",
-                "language": language,
-                "limit": min(100, max_results)  # Maximum 100 par requête
-            }
-            
-            try:
-                # Faire la requête à l'API
-                response = requests.get(self.base_url, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Extraire les URLs des posts
-                    if "posts" in data and isinstance(data["posts"], list):
-                        for post in data["posts"]:
-                            if "url" in post:
-                                self.found_urls.add(post["url"])
-                                print(f"  -> Trouvé: {post['url']}")
-                    
-                    print(f"  -> {len(data.get('posts', []))} posts trouvés pour '{keyword}'")
-                else:
-                    print(f"  -> Erreur API ({response.status_code}): {response.text}")
-                
-                # Pause pour éviter de surcharger l'API
-                self.random_pause()
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Erreur lors de la requête à l'API: {e}")
-            except Exception as e:
-                print(f"Une erreur inattendue s'est produite: {e}")
+        # Paginer tant que l'API renvoie des pages pleines de nouvelles URLs,
+        # sans dépasser le nombre de pages nécessaire pour atteindre max_results
+        max_pages = math.ceil(max_results / limit)
+        for page in range(1, max_pages + 1):
+            nb_urls = len(self.found_urls)
+            nb_posts = await self._search_page(keyword_query, language, limit, page)
+            if nb_posts < limit or len(self.found_urls) == nb_urls or len(self.found_urls) >= max_results:
+                break
+        
+        # Repli : une recherche par mot-clé si la requête OR est trop pauvre
+        if len(self.found_urls) < min(min_results, max_results):
+            print(f"\nSeulement {len(self.found_urls)} URLs trouvées, recherche mot-clé par mot-clé...")
+            await asyncio.gather(*[
+                self._search_page(keyword, language, limit) for keyword in keywords
+            ])
         
         print(f"\nTotal d'URLs LinkedIn uniques trouvées: {len(self.found_urls)}")
         return self.found_urls
     
-    def extract_post_content(self, url):
+    async def extract_post_content(self, url):
         """
         Extrait le contenu d'un post LinkedIn via l'API ScrapingDog
         
+        Si le post a déjà été extrait, la requête est conditionnelle (ETag /
+        Last-Modified) et la version en cache est réutilisée sur un 304.
+        
         Args:
             url (str): URL du post LinkedIn
             
@@ -136,12 +434,25 @@ class LinkedInScrapingDogAPI:
                 "url": url
             }
             
+            # Requête conditionnelle si l'on connaît déjà une version du post
+            post_cache = self._get_post_cache()
+            cached = post_cache.get(url)
+            headers = {}
+            if cached is not None:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
             # Faire la requête à l'API
-            response = requests.get(self.base_url, params=params)
+            status, data, response_headers = await self._fetch(
+                params, prefix="post", fields=POST_FIELDS, headers=headers
+            )
             
-            if response.status_code == 200:
-                data = response.json()
-                
+            if status == 304 and cached is not None:
+                print("  -> Post inchangé, réutilisation de la version en cache")
+                return dict(cached['post'])
+            elif status == 200:
                 # Extraire les données du post
                 if "post" in data:
                     post_info = data["post"]
@@ -165,92 +476,176 @@ class LinkedInScrapingDogAPI:
                     if post_data['text']:
                         post_data['success'] = True
                         print(f"  -> Extraction réussie: {len(post_data['text'])} caractères, {post_data['likes']} likes, {post_data['comments']} commentaires")
+                        
+                        # Conserver le post et ses validateurs pour les prochaines extractions
+                        etag = response_headers.get('ETag')
+                        last_modified = response_headers.get('Last-Modified')
+                        if etag or last_modified:
+                            post_cache[url] = {
+                                'etag': etag,
+                                'last_modified': last_modified,
+                                'post': post_data
+                            }
                     else:
                         print("  -> Échec de l'extraction: aucun contenu trouvé")
                 else:
                     print(f"  -> Erreur: Données de post non trouvées dans la réponse")
             else:
-                print(f"  -> Erreur API ({response.status_code}): {response.text}")
+                print(f"  -> Erreur API ({status}): {data}")
             
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             print(f"  -> Erreur lors de la requête à l'API: {e}")
         except Exception as e:
             print(f"  -> Erreur inattendue: {e}")
         
-        # Pause pour éviter de surcharger l'API
-        self.random_pause()
-        
         return post_data
     
-    def process_urls(self, urls=None, max_urls=None):
+    def _load_index(self):
+        """Charge l'ensemble des URLs déjà extraites lors des exécutions précédentes"""
+        if not os.path.exists(INDEX_PATH):
+            return set()
+        with open(INDEX_PATH, encoding='utf-8') as f:
+            return set(f.read().splitlines())
+    
+    def _output_path(self, filename_prefix, extension, suffix=''):
+        """Construit le chemin d'un fichier de résultats horodaté"""
+        return os.path.join(RESULTS_DIR, f"{filename_prefix}{suffix}_{self.timestamp}.{extension}")
+    
+    async def process_urls(self, urls=None, max_urls=None, filename_prefix='linkedin_posts', refresh=False):
         """
         Traite une liste d'URLs pour extraire le contenu des posts
         
+        Les extractions sont lancées en parallèle, au plus max_workers à la fois.
+        Chaque post est écrit sur disque (CSV et JSONL) dès qu'il est extrait, sans
+        garder l'ensemble des résultats en mémoire. Les appels successifs sur un
+        même scraper complètent les mêmes fichiers. Les URLs déjà extraites avec
+        succès lors d'une exécution précédente (voir INDEX_PATH) sont ignorées,
+        sauf avec refresh=True.
+        
         Args:
             urls (set, optional): Ensemble d'URLs à traiter. Si None, utilise self.found_urls
             max_urls (int, optional): Nombre maximum d'URLs à traiter. Si None, traite toutes les URLs
+            filename_prefix (str): Préfixe pour les noms de fichiers
+            refresh (bool): Ré-extraire aussi les URLs déjà extraites (requêtes conditionnelles)
             
         Returns:
-            list: Liste des données de posts extraites
+            tuple: Chemins des fichiers CSV et JSONL créés
         """
         if urls is None:
             urls = self.found_urls
         
+        # Ne pas repayer l'extraction des posts déjà récupérés
+        if refresh:
+            new_urls = list(urls)
+        else:
+            new_urls = [u for u in urls if u not in self.seen_urls]
+            print(f"{len(urls) - len(new_urls)} URLs déjà extraites lors d'une exécution précédente")
+        
         if max_urls is not None:
-            urls_to_process = list(urls)[:max_urls]
+            urls_to_process = new_urls[:max_urls]
         else:
-            urls_to_process = list(urls)
+            urls_to_process = new_urls
         
         print(f"Traitement de {len(urls_to_process)} URLs...")
         
-        for i, url in enumerate(urls_to_process):
-            print(f"[{i+1}/{len(urls_to_process)}] Traitement de l'URL: {url}")
-            post_data = self.extract_post_content(url)
-            self.results.append(post_data)
+        csv_filename = self._output_path(filename_prefix, 'csv')
+        jsonl_filename = self._output_path(filename_prefix, 'jsonl')
+        nb_results = 0
+        nb_success = 0
+        
+        # Les fichiers sont ouverts en ajout pour ne pas écraser un appel précédent
+        csv_is_new = not os.path.exists(csv_filename) or os.path.getsize(csv_filename) == 0
         
-        # Filtrer les résultats réussis
-        successful_results = [r for r in self.results if r['success']]
-        print(f"\nExtraction réussie pour {len(successful_results)}/{len(self.results)} posts")
+        with open(csv_filename, 'a', encoding='utf-8', newline='') as csv_f, \
+                open(jsonl_filename, 'ab') as jsonl_f, \
+                open(INDEX_PATH, 'a', encoding='utf-8') as index_f:
+            writer = csv.DictWriter(csv_f, fieldnames=CSV_FIELDNAMES)
+            if csv_is_new:
+                writer.writeheader()
+            
+            # Borner le nombre d'extractions en cours, attentes de réessai comprises
+            semaphore = asyncio.Semaphore(self.max_workers)
+            
+            async def extract(url):
+                async with semaphore:
+                    return await self.extract_post_content(url)
+            
+            tasks = [extract(url) for url in urls_to_process]
+            for task in asyncio.as_completed(tasks):
+                post_data = await task
+                writer.writerow(post_data)
+                jsonl_f.write(json_line(post_data))
+                
+                nb_results += 1
+                if post_data['success']:
+                    nb_success += 1
+                    if post_data['url'] not in self.seen_urls:
+                        self.seen_urls.add(post_data['url'])
+                        index_f.write(f"{post_data['url']}\n")
+                
+                # Vider régulièrement les tampons pour pouvoir reprendre après une interruption
+                if nb_results % FLUSH_EVERY == 0:
+                    csv_f.flush()
+                    jsonl_f.flush()
+                    index_f.flush()
+        
+        print(f"\nExtraction réussie pour {nb_success}/{nb_results} posts")
+        print(f"Résultats sauvegardés en CSV: {csv_filename}")
+        print(f"Résultats sauvegardés en JSONL: {jsonl_filename}")
         
-        return self.results
+        return csv_filename, jsonl_filename
     
-    def save_results(self, filename_prefix='linkedin_posts'):
+    def save_urls(self, filename_prefix='linkedin_posts'):
         """
-        Sauvegarde les résultats dans des fichiers CSV et JSON
+        Sauvegarde les URLs trouvées dans un fichier texte
         
         Args:
             filename_prefix (str): Préfixe pour les noms de fichiers
             
         Returns:
-            tuple: Chemins des fichiers CSV et JSON créés
+            str: Chemin du fichier d'URLs créé
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        csv_filename = os.path.join(RESULTS_DIR, f"{filename_prefix}_{timestamp}.csv")
-        json_filename = os.path.join(RESULTS_DIR, f"{filename_prefix}_{timestamp}.json")
-        urls_filename = os.path.join(RESULTS_DIR, f"{filename_prefix}_urls_{timestamp}.txt")
+        urls_filename = self._output_path(filename_prefix, 'txt', suffix='_urls')
         
         # Sauvegarder les URLs brutes
         with open(urls_filename, 'w', encoding='utf-8') as f:
             for url in self.found_urls:
                 f.write(f"{url}\n")
         
-        # Sauvegarder en CSV
-        with open(csv_filename, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['url', 'author', 'date', 'text', 'likes', 'comments', 'shares', 'success']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for result in self.results:
-                writer.writerow(result)
-        
-        # Sauvegarder en JSON
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=2)
-        
         print(f"URLs sauvegardées dans: {urls_filename}")
-        print(f"Résultats sauvegardés en CSV: {csv_filename}")
-        print(f"Résultats sauvegardés en JSON: {json_filename}")
         
-        return csv_filename, json_filename, urls_filename
+        return urls_filename
+    
+    async def run(self, keywords, language='fr', max_results=100, sample_size=10,
+                  filename_prefix='linkedin_posts_ia_scrapingdog', refresh=False):
+        """
+        Enchaîne la recherche, la sauvegarde des URLs et l'extraction d'un échantillon
+        
+        Args:
+            keywords (list): Liste de mots-clés à rechercher
+            language (str): Langue des résultats ('fr' pour français)
+            max_results (int): Nombre maximum de résultats à récupérer
+            sample_size (int): Nombre maximum d'URLs à traiter
+            filename_prefix (str): Préfixe pour les noms de fichiers
+            refresh (bool): Ré-extraire aussi les URLs déjà extraites (requêtes conditionnelles)
+        """
+        try:
+            # Rechercher des posts LinkedIn
+            urls = await self.search_linkedin_posts(keywords, language=language, max_results=max_results)
+            
+            # Traiter un échantillon pour tester
+            sample_size = min(sample_size, len(urls))
+            if sample_size > 0:
+                self.save_urls(filename_prefix=filename_prefix)
+                
+                # Les résultats sont sauvegardés au fil de l'extraction
+                print(f"\nTraitement d'un échantillon de {sample_size} URLs pour test...")
+                await self.process_urls(max_urls=sample_size, filename_prefix=filename_prefix,
+                                        refresh=refresh)
+            else:
+                print("Aucune URL trouvée pour le test.")
+        finally:
+            await self.close()
 
 def main():
     """Fonction principale"""
@@ -259,7 +654,17 @@ def main():
     parser.add_argument('--api_key', required=True, help='Clé API ScrapingDog')
     parser.add_argument('--max_results', type=int, default=100, help='Nombre maximum de résultats à récupérer')
     parser.add_argument('--sample_size', type=int, default=10, help='Taille de l\'échantillon pour le test')
+    parser.add_argument('--rate', type=float, default=5, help='Nombre maximum de requêtes par seconde vers l\'API')
+    parser.add_argument('--burst', type=int, default=10, help='Nombre de requêtes autorisées en rafale')
+    parser.add_argument('--max_workers', type=int, default=8, help='Nombre maximum d\'extractions simultanées')
+    parser.add_argument('--refresh', action='store_true', help='Ré-extraire les posts déjà extraits (requêtes conditionnelles)')
     args = parser.parse_args()
+    if args.max_results <= 0:
+        parser.error("--max_results doit être strictement positif")
+    if args.rate <= 0:
+        parser.error("--rate doit être strictement positif")
+    if args.burst < 1:
+        parser.error("--burst doit être au moins 1")
     
     # Mots-clés liés à l'IA en français
     keywords = [
@@ -278,21 +683,11 @@ def main():
     ]
     
     # Initialiser le scraper
-    scraper = LinkedInScrapingDogAPI(api_key=args.api_key, pause_min=1, pause_max=3)
-    
-    # Rechercher des posts LinkedIn
-    urls = scraper.search_linkedin_posts(keywords, language='fr', max_results=args.max_results)
+    scraper = LinkedInScrapingDogAPI(api_key=args.api_key, rate=args.rate, burst=args.burst,
+                                     max_workers=args.max_workers)
     
-    # Traiter un échantillon pour tester
-    sample_size = min(args.sample_size, len(urls))
-    if sample_size > 0:
-        print(f"\nTraitement d'un échantillon de {sample_size} URLs pour test...")
-        scraper.process_urls(max_urls=sample_size)
-        
-        # Sauvegarder les résultats
-        scraper.save_results(filename_prefix='linkedin_posts_ia_scrapingdog')
-    else:
-        print("Aucune URL trouvée pour le test.")
+    asyncio.run(scraper.run(keywords, language='fr', max_results=args.max_results,
+                            sample_size=args.sample_size, refresh=args.refresh))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Analyse de sentiment d'un corpus de posts LinkedIn
+--------------------------------------------------
+Ce script calcule en lot le sentiment des posts collectés par le scraper
+ScrapingDog (fichier CSV produit par process_urls), à partir du lexique VADER
+utilisé par l'API /analyser.
+
+Dépendances : pandas, nltk
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from nlp import WORD_RE, get_sia
+
+# Constante de normalisation du score composé de VADER
+VADER_ALPHA = 15
+
+def batch_sentiment(texts):
+    """
+    Calcule le sentiment d'un ensemble de textes de façon vectorisée
+
+    Chaque mot est pondéré par sa valence dans le lexique VADER, sans les
+    règles de négation et d'intensité appliquées par polarity_scores.
+
+    Args:
+        texts (list): Liste des textes à analyser
+
+    Returns:
+        pd.DataFrame: Nombre de mots, sommes des valences positives et négatives,
+        et score composé normalisé entre -1 et 1, une ligne par texte
+    """
+    lexicon = get_sia().lexicon
+
+    tokens = pd.Series(texts, dtype='object').fillna('').str.lower().str.findall(WORD_RE)
+
+    # Un mot par ligne, indexé par le numéro du texte ; NaN pour les mots hors lexique
+    valences = tokens.explode().map(lexicon)
+
+    scores = valences.groupby(level=0).sum()
+    return pd.DataFrame({
+        'nb_mots': tokens.str.len(),
+        'positif': valences.clip(lower=0).groupby(level=0).sum(),
+        'negatif': valences.clip(upper=0).groupby(level=0).sum(),
+        'compound': scores / (scores ** 2 + VADER_ALPHA) ** 0.5,
+    })
+
+def main():
+    """Fonction principale"""
+    # Parser les arguments de ligne de commande
+    parser = argparse.ArgumentParser(description='Analyse de sentiment d\'un corpus de posts LinkedIn')
+    parser.add_argument('input_csv', help='Fichier CSV de posts produit par le scraper')
+    parser.add_argument('--output_csv', help='Fichier CSV de sortie (par défaut: <input>_sentiment.csv)')
+    args = parser.parse_args()
+
+    output_csv = args.output_csv or f"{os.path.splitext(args.input_csv)[0]}_sentiment.csv"
+
+    posts = pd.read_csv(args.input_csv)
+    print(f"Analyse de {len(posts)} posts...")
+
+    sentiment = batch_sentiment(posts['text'].tolist())
+    posts = pd.concat([posts, sentiment.set_index(posts.index)], axis=1)
+    posts.to_csv(output_csv, index=False)
+
+    print(f"Score composé moyen: {posts['compound'].mean():.3f}")
+    if 'likes' in posts.columns:
+        print(f"Corrélation score composé / likes: {posts['compound'].corr(posts['likes']):.3f}")
+    print(f"Résultats sauvegardés en CSV: {output_csv}")
+
+if __name__ == "__main__":
+    main()
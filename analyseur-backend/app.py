@@ -1,72 +1,136 @@
+"""
+API Flask d'analyse de posts LinkedIn (/analyser)
+
+Dépendances : flask, flask-cors, nltk
+Optionnelles : orjson (réponses JSON plus rapides), gunicorn (déploiement)
+"""
+
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+import os
+import re
 import string
 
-# Téléchargement des ressources NLTK
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('vader_lexicon')
-nltk.download('punkt_tab')
+from nlp import ensure_nltk_resource, get_sia, tokenize
+
+# Sérialisation JSON accélérée si orjson est installé
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Téléchargement des stopwords NLTK, seulement s'ils sont absents
+ensure_nltk_resource('stopwords', 'corpora/stopwords')
+
+class OrjsonProvider(JSONProvider):
+    """Fournisseur JSON de Flask basé sur orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # Initialisation
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
-sia = SentimentIntensityAnalyzer()
-stop_words = set(stopwords.words('french'))
-stop_words.update(['intelligence', 'artificielle', 'lia', 'ia', 'intelligenceartificielle'])
+stop_words = frozenset(stopwords.words('french')).union(
+    ['intelligence', 'artificielle', 'lia', 'ia', 'intelligenceartificielle']
+)
+
+# Emojis pris en compte dans le score d'engagement
+EMOJIS = ("😀", "😂", "🔥", "💡", "🚀", "✨", "🎯", "🤖", "🧠")
+
+# Emojis dont l'absence déclenche une suggestion
+SUGGESTION_EMOJIS = ("😀", "🚀", "✨", "🔥", "🤖", "🧠")
 
-def calculate_engagement_score(text):
+# Caractères utiles au score et aux suggestions, repérés en un seul passage
+FEATURE_RE = re.compile("[" + re.escape("".join(EMOJIS) + "#?") + "]")
+
+def extract_features(text):
+    return Counter(FEATURE_RE.findall(text))
+
+def calculate_engagement_score(text, tokens, features):
     longueur = len(text)
-    nb_emojis = sum(1 for c in text if c in "😀😂🔥💡🚀✨🎯🤖🧠")
-    nb_mots = len(word_tokenize(text))
+    nb_emojis = sum(features[e] for e in EMOJIS)
+    nb_mots = len(tokens)
     return min(100, longueur / 10 + nb_emojis * 5 + nb_mots)
 
 def analyze_sentiment(text):
-    return sia.polarity_scores(text)
+    return get_sia().polarity_scores(text)
 
-def extract_keywords(text):
-    words = word_tokenize(text.lower())
-    filtered = [w for w in words if w.isalnum() and w not in stop_words]
-    freq = Counter(filtered)
+def extract_keywords(tokens):
+    freq = Counter(w for w in tokens if w not in stop_words)
     return freq.most_common(5)
 
-def generate_suggestions(text, score):
-    suggestions = []
-    if len(text) > 1000:
-        suggestions.append("Post trop long, raccourcissez-le.")
-    if "#" not in text:
-        suggestions.append("Ajoutez des hashtags.")
-    if "?" not in text:
-        suggestions.append("Ajoutez une question.")
-    if not any(e in text for e in ["😀", "🚀", "✨", "🔥", "🤖", "🧠"]):
-        suggestions.append("Ajoutez des emojis pertinents.")
-    if score < 40:
-        suggestions.append("Score bas. Revoir ton style ou la structure.")
-    if score > 85:
-        suggestions.append("Excellent post !")
-    return suggestions
+# Suggestions et conditions qui les déclenchent, dans l'ordre d'affichage
+SUGGESTION_RULES = (
+    ("Post trop long, raccourcissez-le.", lambda text, score, features: len(text) > 1000),
+    ("Ajoutez des hashtags.", lambda text, score, features: not features["#"]),
+    ("Ajoutez une question.", lambda text, score, features: not features["?"]),
+    ("Ajoutez des emojis pertinents.",
+     lambda text, score, features: not any(features[e] for e in SUGGESTION_EMOJIS)),
+    ("Score bas. Revoir ton style ou la structure.", lambda text, score, features: score < 40),
+    ("Excellent post !", lambda text, score, features: score > 85),
+)
 
-@app.route('/analyser', methods=['POST'])
-def analyser_post():
-    data = request.get_json()
-    texte = data.get('texte', '')
-    score = calculate_engagement_score(texte)
+# Listes de suggestions précalculées pour chaque combinaison de conditions (bit i = règle i)
+SUGGESTIONS = tuple(
+    tuple(message for i, (message, _) in enumerate(SUGGESTION_RULES) if mask >> i & 1)
+    for mask in range(1 << len(SUGGESTION_RULES))
+)
+
+def generate_suggestions(text, score, features):
+    mask = 0
+    for i, (_, condition) in enumerate(SUGGESTION_RULES):
+        mask |= condition(text, score, features) << i
+    return SUGGESTIONS[mask]
+
+# Les résultats sont partagés entre les requêtes, ils sont donc en lecture seule
+@lru_cache(maxsize=2048)
+def analyser_texte(texte):
+    # Découpage en mots et repérage des emojis, # et ? partagés entre les étapes
+    tokens = tokenize(texte)
+    features = extract_features(texte)
+    score = calculate_engagement_score(texte, tokens, features)
     sentiment = analyze_sentiment(texte)
-    keywords = extract_keywords(texte)
-    suggestions = generate_suggestions(texte, score)
-    return jsonify({
+    keywords = extract_keywords(tokens)
+    suggestions = generate_suggestions(texte, score, features)
+    return MappingProxyType({
         "score": score,
-        "sentiment": sentiment,
-        "keywords": keywords,
+        "sentiment": MappingProxyType(sentiment),
+        "keywords": tuple(keywords),
         "suggestions": suggestions
     })
 
+@app.route('/analyser', methods=['POST'])
+def analyser_post():
+    data = request.get_json()
+    texte = data.get('texte', '')
+    resultat = analyser_texte(texte)
+    # Copie en dictionnaires sérialisables, le résultat en cache restant intact
+    return jsonify({**resultat, "sentiment": dict(resultat["sentiment"])})
+
+# Le lexique VADER est chargé à la première analyse, donc par chaque worker
+# gunicorn après le fork : démarrage rapide, mais mémoire non partagée.
+# Avec PRECHARGER_VADER=1 et --preload, il est chargé une fois dans le
+# processus maître et partagé entre workers (copy-on-write).
+if os.environ.get('PRECHARGER_VADER') == '1':
+    get_sia()
+
+# Serveur de développement uniquement (FLASK_DEBUG=1 pour le mode debug).
+# En production, servir l'application avec plusieurs workers multi-threads :
+#   gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5001 app:app
+# ou, pour partager le lexique VADER entre les workers :
+#   PRECHARGER_VADER=1 gunicorn --preload -w 4 -k gthread --threads 8 -b 0.0.0.0:5001 app:app
 if __name__ == '__main__':
-    app.run(debug=True, port=5001)
+    app.run(port=5001)
 
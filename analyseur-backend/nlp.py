@@ -0,0 +1,27 @@
+"""
+Outils de traitement du texte partagés par l'API /analyser et l'analyse de corpus
+"""
+
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+from functools import lru_cache
+import re
+
+# Mots alphanumériques Unicode (accents, œ, æ compris ; sans « _ »)
+WORD_RE = re.compile(r"[^\W_]+")
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+# Téléchargement d'une ressource NLTK, seulement si elle est absente
+def ensure_nltk_resource(package, path):
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        nltk.download(package, quiet=True)
+
+# Le lexique VADER n'est chargé qu'à la première analyse
+@lru_cache(maxsize=None)
+def get_sia():
+    ensure_nltk_resource('vader_lexicon', 'sentiment/vader_lexicon.zip')
+    return SentimentIntensityAnalyzer()